@@ -3,19 +3,52 @@ Configuration module for the Steel Heat Treatment Optimization project.
 Centralizes all paths and database column mappings.
 """
 import os
+import json
 
 # Project paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(SCRIPT_DIR)
 DATASETS_DIR = os.path.join(ROOT_DIR, 'datasets')
 OUTPUT_DIR = os.path.join(ROOT_DIR, 'outputs')
+CACHE_DIR = os.path.join(ROOT_DIR, '.cache')  # reusable renders, kept out of OUTPUT_DIR cleanup
 
 # File paths
 RAW_DATA_PATH = os.path.join(DATASETS_DIR, 'Tempering data for carbon and low alloy steels - Raiipa(in).csv')
 PROCESSED_DATA_PATH = os.path.join(DATASETS_DIR, 'preprocessed_steel_data.csv')
+# Fingerprint of the inputs that produced the processed data; lets preprocessing skip unchanged runs
+PROCESSED_META_PATH = PROCESSED_DATA_PATH + '.meta.json'
 QUERIES_PATH = os.path.join(ROOT_DIR, 'consultas.json')
 LOG_FILE_PATH = os.path.join(ROOT_DIR, 'error_log.txt')
 
+# Extra full-table diagnostics in preprocessing (missing-value scan); off for normal runs
+PIPELINE_DEBUG = os.environ.get('STEEL_PIPELINE_DEBUG') == '1'
+
+# Worker processes for rendering plots in parallel (1 = render inline in the main process).
+# Invalid STEEL_PLOT_WORKERS values fall back to the default.
+_DEFAULT_PLOT_WORKERS = min(4, os.cpu_count() or 1)
+try:
+    PLOT_WORKERS = max(1, int(os.environ.get('STEEL_PLOT_WORKERS', _DEFAULT_PLOT_WORKERS)))
+except ValueError:
+    PLOT_WORKERS = _DEFAULT_PLOT_WORKERS
+
+# Shared savefig options: fast zlib level for PNG output (plots are written once per run).
+# STEEL_PLOT_FAST_PNG=1 skips compression entirely for quick development iterations.
+_PNG_COMPRESS_LEVEL = 0 if os.environ.get('STEEL_PLOT_FAST_PNG') == '1' else 1
+SAVEFIG_KWARGS = {'pil_kwargs': {'compress_level': _PNG_COMPRESS_LEVEL, 'optimize': False}}
+
+_QUERIES_CACHE = None
+
+def load_queries():
+    """
+    Parses consultas.json once per process and returns the cached list.
+    Shared by run_project.py and generate_index.py so the file is read a single time.
+    """
+    global _QUERIES_CACHE
+    if _QUERIES_CACHE is None:
+        with open(QUERIES_PATH, 'r', encoding='utf-8') as f:
+            _QUERIES_CACHE = json.load(f)
+    return _QUERIES_CACHE
+
 # Database column configuration
 class DB_CONFIG:
     """Maps column names from the CSV database."""
@@ -2,10 +2,22 @@
 Generates index.html automatically from consultas.json
 targetting GitHub Pages structure (docs/ folder).
 """
-import json
 import os
+import string
 import config
 
+# Card markup for one query; filled once per query with Template.substitute
+_CARD_TEMPLATE = string.Template("""
+                <div class="query-card">
+                    <span class="badge" style="background: ${badge_bg}">${opt_label} Opt</span>
+                    <h3>${display_name}</h3>
+                    <div class="description">
+                        ${desc_html}
+                    </div>
+                    <a href="${link_ref}" class="btn" target="_blank">View Heatmap →</a>
+                </div>
+            """)
+
 def format_filters_to_html(filters):
     """
     Converts filter dictionary to readable HTML for the query card.
@@ -70,8 +82,7 @@ def generate_index_html():
         output_html_path = os.path.join(docs_dir, 'index.html')
 
         # Lê as consultas
-        with open(config.QUERIES_PATH, 'r', encoding='utf-8') as f:
-            queries = json.load(f)
+        queries = config.load_queries()
         
         # --- HTML HEADER & CSS ---
         html_content = """<!DOCTYPE html>
@@ -202,6 +213,7 @@ def generate_index_html():
             
             <div class="query-grid">
 """
+        parts = [html_content]
         
         # --- LOOP PARA GERAR CARDS DINAMICAMENTE ---
         for query in queries:
@@ -218,31 +230,27 @@ def generate_index_html():
             # O link é relativo: heatmaps/Nome_Do_Arquivo.html
             link_ref = f"heatmaps/{q_name}_heatmap.html"
             
-            card_html = f"""
-                <div class="query-card">
-                    <span class="badge" style="background: {badge_bg}">{opt_by.capitalize()} Opt</span>
-                    <h3>{display_name}</h3>
-                    <div class="description">
-                        {desc_html}
-                    </div>
-                    <a href="{link_ref}" class="btn" target="_blank">View Heatmap →</a>
-                </div>
-            """
-            html_content += card_html
+            parts.append(_CARD_TEMPLATE.substitute(
+                badge_bg=badge_bg,
+                opt_label=opt_by.capitalize(),
+                display_name=display_name,
+                desc_html=desc_html,
+                link_ref=link_ref,
+            ))
 
         # --- FOOTER ---
-        html_content += """
+        parts.append("""
             </div> </div> <footer>
             <p>Generated automatically via Python | Steel Optimization Research</p>
         </footer>
     </div>
 </body>
 </html>
-"""
+""")
         
         # Salva o arquivo final
         with open(output_html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(''.join(parts))
         
         print(f"✓ Fancy Index HTML generated successfully: {output_html_path}")
         return True
@@ -2,34 +2,158 @@
 Graph visualization module for process flow diagrams.
 Generates comparison and full graph visualizations.
 """
+import hashlib
+import os
+import shutil
+import matplotlib
+matplotlib.use('Agg')  # batch rendering only; networkx imports pyplot internally
 import networkx as nx
-import matplotlib.pyplot as plt
-from collections import defaultdict
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 import numpy as np
+import config
+
+# tab10 palette resolved once; path colours are picked from it per plot
+_TAB10 = np.asarray(colormaps['tab10'](np.arange(10)))
+
+# Fixed figure margins (what tight_layout settled on for these figure sizes)
+_COMPARISON_MARGINS = dict(left=0.01, right=0.99, top=0.94, bottom=0.07)
+_FULL_GRAPH_MARGINS = dict(left=0.01, right=0.99, top=0.97, bottom=0.01)
+
+# Above this many nodes the full graph is rasterized and saved at a lower DPI
+_FULL_GRAPH_LARGE_NODES = 2000
+
+# Above this many nodes only the best-connected nodes of the master graph are drawn
+_FULL_GRAPH_MAX_NODES = 5000
+
+# Bump when plot_full_graph output changes so cached renders are not reused
+_FULL_GRAPH_CACHE_VERSION = 1
+
+# Display graph + layout per filtered graph topology; queries sharing filters reuse them
+_LAYOUT_CACHE = {}
+_LAYOUT_CACHE_SIZE = 32
 
 
 def _deterministic_layout(G):
     """
     Creates a 100% reproducible layout based on node values and layers.
     Ensures scientific consistency by sorting nodes deterministically.
+
+    All nodes are ordered with a single np.lexsort over (layer, sort_val, name)
+    instead of a Python sort per layer; positions are views into one (N, 2) array.
     """
-    pos = {}
-    nodes_by_layer = defaultdict(list)
-    
-    for node, data in G.nodes(data=True):
-        layer = data.get('layer', 0)
-        nodes_by_layer[layer].append((node, data))
-    
-    for layer, nodes in nodes_by_layer.items():
-        nodes.sort(key=lambda x: (x[1].get('sort_val', 0), str(x[0])), reverse=True)
-        
-        n = len(nodes)
-        for i, (node, _) in enumerate(nodes):
-            x = layer
-            y = (n - 1) * 0.5 - i 
-            pos[node] = np.array([x, y])
-            
-    return pos
+    nodes = list(G.nodes())
+    n_nodes = len(nodes)
+    if n_nodes == 0:
+        return {}
+
+    layers = np.fromiter((d.get('layer', 0) for _, d in G.nodes(data=True)),
+                         dtype=np.float64, count=n_nodes)
+    sort_vals = np.fromiter((d.get('sort_val', 0) for _, d in G.nodes(data=True)),
+                            dtype=np.float64, count=n_nodes)
+    names = np.array([str(n) for n in nodes])
+
+    # Ascending (layer, sort_val, name): within a layer the lowest sort_val gets the lowest y
+    order = np.lexsort((names, sort_vals, layers))
+    sorted_layers = layers[order]
+
+    starts = np.flatnonzero(np.r_[True, sorted_layers[1:] != sorted_layers[:-1]])
+    counts = np.diff(np.r_[starts, n_nodes])
+    group = np.repeat(np.arange(len(starts)), counts)
+    rank = np.arange(n_nodes) - starts[group]
+
+    coords = np.empty((n_nodes, 2), dtype=np.float64)
+    coords[:, 0] = sorted_layers
+    coords[:, 1] = rank - (counts[group] - 1) * 0.5
+
+    return {nodes[i]: coords[k] for k, i in enumerate(order)}
+
+
+def _display_attrs(data):
+    """(layer, sort value) a node contributes to the comparison layout; non-numeric values sort as 0."""
+    value = data.get('value', 0)
+    return data.get('layer', 0), value if isinstance(value, (int, float)) else 0
+
+
+def _path_colors(n):
+    """Same picks as cm.tab10(np.linspace(0, 1, n)), read from the cached palette."""
+    idx = np.minimum((np.linspace(0, 1, n) * len(_TAB10)).astype(int), len(_TAB10) - 1)
+    return _TAB10[idx]
+
+
+def _add_edge_collection(ax, segments, **kwargs):
+    """
+    Adds all (E, 2, 2) edge segments as one LineCollection and applies the
+    same 5% view padding networkx uses around drawn edges.
+    """
+    ax.add_collection(LineCollection(segments, **kwargs))
+    points = segments.reshape(-1, 2)
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    pad = 0.05 * (hi - lo)
+    ax.update_datalim([lo - pad, hi + pad])
+    ax.autoscale_view()
+
+
+def _full_graph_cache_path(graph, title, dpi):
+    """
+    Cache file for the rendered full graph, keyed by a hash of everything the
+    image depends on: nodes with their layer/sort value, the edge set, the title
+    and the savefig settings (DPI and PNG compression level).
+    """
+    nodes = sorted((str(n), d.get('layer', 0), d.get('sort_val', 0)) for n, d in graph.nodes(data=True))
+    edges = sorted((str(u), str(v)) for u, v in graph.edges())
+    savefig = (dpi, config.SAVEFIG_KWARGS['pil_kwargs']['compress_level'])
+    digest = hashlib.blake2b(repr((_FULL_GRAPH_CACHE_VERSION, title, savefig, nodes, edges)).encode(),
+                             digest_size=16).hexdigest()
+    return os.path.join(config.CACHE_DIR, f"full_graph_{digest}.png")
+
+
+def _store_full_graph_cache(image_filename, cache_path):
+    """
+    Copies the fresh render into the cache and deletes the renders left
+    by earlier keys, so only the current one is kept.
+    """
+    try:
+        os.makedirs(config.CACHE_DIR, exist_ok=True)
+        keep = os.path.basename(cache_path)
+        for entry in os.scandir(config.CACHE_DIR):
+            if entry.name.startswith('full_graph_') and entry.name != keep:
+                os.remove(entry.path)
+        shutil.copyfile(image_filename, cache_path)
+    except OSError:
+        pass
+
+
+def _full_graph_layout(graph):
+    """
+    Layered layout for the full graph. Unusable sort values fall back to ordering each
+    layer by name only (on a copy, so the caller's node data is left untouched);
+    unusable layers fall back to a seeded spring layout, which cannot fail.
+    """
+    try:
+        return _deterministic_layout(graph)
+    except Exception:
+        pass
+    try:
+        unsorted = graph.copy()
+        nx.set_node_attributes(unsorted, 0, 'sort_val')
+        return _deterministic_layout(unsorted)
+    except Exception:
+        return nx.spring_layout(graph, seed=42)
+
+
+def _top_degree_nodes(graph, k):
+    """
+    Deterministic sample of k nodes: highest degree first, ties broken by node name.
+    """
+    nodes = list(graph.nodes())
+    degrees = np.fromiter((d for _, d in graph.degree(nodes)), dtype=np.int64, count=len(nodes))
+    names = np.array([str(n) for n in nodes])
+    order = np.lexsort((names, -degrees))[:k]
+    return [nodes[i] for i in order]
 
 
 def plot_filtered_graph_comparison(graph, paths, cost, optimize_by, output_image_filename):
@@ -42,53 +166,91 @@ def plot_filtered_graph_comparison(graph, paths, cost, optimize_by, output_image
 
     print(f"Generating deterministic comparison graph: {output_image_filename}...")
     
-    paths = sorted(paths, key=lambda p: str(p))
+    # Identical routes would be drawn on top of each other; keep one of each
+    paths = sorted({tuple(p): p for p in paths}.values(), key=lambda p: str(p))
 
-    G_display = nx.DiGraph()
-    
-    def get_label(node_name):
-        if "|" in str(node_name): 
-            return str(node_name).split("|")[0].strip()
-        return str(node_name)
+    # Display label per node, computed once ("Time: 600 s | id:3" -> "Time: 600 s")
+    labels = {n: (str(n).split("|", 1)[0].strip() if "|" in str(n) else str(n))
+              for n in graph.nodes()}
 
-    sorted_edges = sorted(graph.edges(), key=lambda x: (str(x[0]), str(x[1])))
+    # The display graph and layout depend on the edges and on each node's layer and value
+    cache_key = (frozenset(graph.edges()),
+                 frozenset((n, _display_attrs(d)) for n, d in graph.nodes(data=True)))
+    cached = _LAYOUT_CACHE.get(cache_key)
+    if cached is not None:
+        G_display, pos = cached
+    else:
+        # Lexicographic (source, target) order via one native lexsort over string arrays
+        edges = list(graph.edges())
+        sorted_edges = []
+        if edges:
+            u_keys = np.array([str(u) for u, _ in edges])
+            v_keys = np.array([str(v) for _, v in edges])
+            sorted_edges = [edges[i] for i in np.lexsort((v_keys, u_keys))]
 
-    for u, v in sorted_edges:
-        u_lbl, v_lbl = get_label(u), get_label(v)
-        
-        u_data = graph.nodes[u]
-        v_data = graph.nodes[v]
-        
-        u_val = u_data.get('value', 0) if isinstance(u_data.get('value'), (int, float)) else 0
-        v_val = v_data.get('value', 0) if isinstance(v_data.get('value'), (int, float)) else 0
+        # Collect attributes and edges first, then insert them in bulk
+        node_attrs = {}
+        edge_list = []
+        for u, v in sorted_edges:
+            u_lbl, v_lbl = labels[u], labels[v]
+            
+            u_layer, u_val = _display_attrs(graph.nodes[u])
+            v_layer, v_val = _display_attrs(graph.nodes[v])
+
+            node_attrs[u_lbl] = {'layer': u_layer, 'sort_val': u_val}
+            node_attrs[v_lbl] = {'layer': v_layer, 'sort_val': v_val}
+            edge_list.append((u_lbl, v_lbl))
 
-        G_display.add_node(u_lbl, layer=u_data.get('layer', 0), sort_val=u_val)
-        G_display.add_node(v_lbl, layer=v_data.get('layer', 0), sort_val=v_val)
-        G_display.add_edge(u_lbl, v_lbl)
+        G_display = nx.DiGraph()
+        G_display.add_nodes_from(node_attrs.items())
+        G_display.add_edges_from(edge_list)
 
-    pos = _deterministic_layout(G_display)
+        pos = _deterministic_layout(G_display)
 
-    plt.figure(figsize=(24, 16))
+        if len(_LAYOUT_CACHE) >= _LAYOUT_CACHE_SIZE:
+            _LAYOUT_CACHE.clear()
+        _LAYOUT_CACHE[cache_key] = (G_display, pos)
+
+    # Figures are built on an Agg canvas directly, outside pyplot's global figure registry
+    fig = Figure(figsize=(24, 16))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     
-    all_path_nodes = set()
-    for p in paths:
-        all_path_nodes.update([get_label(n) for n in p])
+    all_path_nodes = frozenset(labels[n] for p in paths for n in p)
     
-    other_nodes = sorted([n for n in G_display.nodes() if n not in all_path_nodes], key=str)
+    # pos is already in deterministic (layer, sort_val, name) order; filtering it needs no sort
+    other_nodes = [n for n in pos if n not in all_path_nodes]
     
-    nx.draw_networkx_nodes(G_display, pos, nodelist=other_nodes, node_size=1000, 
-                          node_color='#f0f0f0', alpha=0.5)
-    nx.draw_networkx_edges(G_display, pos, edge_color='#e0e0e0', arrows=False, alpha=0.4)
-    nx.draw_networkx_labels(G_display, pos, labels={n:n for n in other_nodes}, 
+    # Background drawn as one scatter + one LineCollection straight from the layout arrays;
+    # both are rasterized so vector outputs keep only the coloured paths as vectors
+    if other_nodes:
+        bg_xy = np.array([pos[n] for n in other_nodes])
+        ax.scatter(bg_xy[:, 0], bg_xy[:, 1], s=1000, c='#f0f0f0', alpha=0.5, zorder=2,
+                   rasterized=True)
+    if G_display.number_of_edges():
+        segments = np.array([(pos[u], pos[v]) for u, v in G_display.edges()])
+        _add_edge_collection(ax, segments, colors='#e0e0e0', linewidths=1.0,
+                             alpha=0.4, zorder=1, rasterized=True)
+    # Background and path labels take two calls: networkx 3.0 (still allowed by
+    # requirements.txt) rejects per-node font size/colour/weight dicts
+    nx.draw_networkx_labels(G_display, pos, ax=ax, labels={n: n for n in other_nodes},
                            font_color='#bbbbbb', font_size=8)
 
-    colors = plt.cm.tab10(np.linspace(0, 1, len(paths)))
+    colors = _path_colors(len(paths))
     legend_handles = []
     
     num_paths = len(paths)
     rad_step = 0.15 
     
-    for i, path in enumerate(paths):
+    # Display labels per path, resolved once and shared by the node and edge overlays
+    paths_clean = [[labels[n] for n in path] for path in paths]
+    
+    # Path edges grouped by arc style; every path gets its own rad, so this is one call per path
+    edges_by_style = {}
+    # Path node rings for all strategies in one collection; later paths still draw on top
+    ring_nodes, ring_colors = [], []
+    
+    for i, path_clean in enumerate(paths_clean):
         if num_paths > 1:
             rad = (i - (num_paths - 1) / 2) * rad_step
             connection_style = f"arc3,rad={rad:.2f}"
@@ -96,20 +258,28 @@ def plot_filtered_graph_comparison(graph, paths, cost, optimize_by, output_image
             connection_style = "arc3,rad=0"
             
         color = colors[i]
-        path_clean = [get_label(n) for n in path]
         edges = list(zip(path_clean, path_clean[1:]))
         
-        nx.draw_networkx_edges(G_display, pos, edgelist=edges, edge_color=[color], 
-                             width=2.5, connectionstyle=connection_style, 
-                             arrowstyle='-|>', arrowsize=20)
+        style_edges, style_colors = edges_by_style.setdefault(connection_style, ([], []))
+        style_edges.extend(edges)
+        style_colors.extend([color] * len(edges))
         
-        nx.draw_networkx_nodes(G_display, pos, nodelist=path_clean, node_size=2000, 
-                              node_color='white', edgecolors=[color], linewidths=2.5)
+        ring_nodes.extend(path_clean)
+        ring_colors.extend([color] * len(path_clean))
         
-        legend_handles.append(plt.Line2D([], [], color=color, linewidth=2.5, 
+        legend_handles.append(Line2D([], [], color=color, linewidth=2.5, 
                                        label=f'Strategy #{i+1}'))
 
-    nx.draw_networkx_labels(G_display, pos, labels={n:n for n in all_path_nodes}, 
+    nx.draw_networkx_nodes(G_display, pos, ax=ax, nodelist=ring_nodes, node_size=2000, 
+                          node_color='white', edgecolors=ring_colors, linewidths=2.5)
+
+    for connection_style, (style_edges, style_colors) in edges_by_style.items():
+        nx.draw_networkx_edges(G_display, pos, ax=ax, edgelist=style_edges, edge_color=style_colors, 
+                             width=2.5, connectionstyle=connection_style, 
+                             arrowstyle='-|>', arrowsize=20)
+
+    # Sorted so the path labels are drawn in a reproducible order
+    nx.draw_networkx_labels(G_display, pos, ax=ax, labels={n: n for n in sorted(all_path_nodes, key=str)},
                            font_size=11, font_weight='bold')
 
     unit = "s" if optimize_by == 'time' else "C" if optimize_by == 'temperature' else "(Score)"
@@ -125,43 +295,69 @@ def plot_filtered_graph_comparison(graph, paths, cost, optimize_by, output_image
 
     subtitle = f"Comparing {num_paths} Best Routes | Cost: {cost:.2f} {unit}"
     
-    plt.title(f"{main_title}\n{subtitle}", fontsize=20, pad=20)
-    plt.legend(handles=legend_handles, loc='upper center', bbox_to_anchor=(0.5, -0.05), 
+    ax.set_title(f"{main_title}\n{subtitle}", fontsize=20, pad=20)
+    ax.legend(handles=legend_handles, loc='upper center', bbox_to_anchor=(0.5, -0.05), 
               ncol=min(5, len(paths)), fontsize=12, frameon=True, shadow=True)
     
-    plt.axis('off')
-    plt.tight_layout()
-    plt.savefig(output_image_filename, dpi=300, bbox_inches='tight')
-    plt.close()
+    ax.axis('off')
+    fig.subplots_adjust(**_COMPARISON_MARGINS)
+    # 150 DPI is still print quality on a 24x16 in canvas; the tight box keeps every legend row
+    fig.savefig(output_image_filename, dpi=150, bbox_inches='tight', **config.SAVEFIG_KWARGS)
     print(f"Comparison graph saved: {output_image_filename}")
 
 
-def plot_full_graph(graph, output_image_filename):
-    """Visualizes the complete master graph."""
+def plot_full_graph(graph, output_image_filename, max_nodes=_FULL_GRAPH_MAX_NODES):
+    """
+    Visualizes the complete master graph.
+    Graphs above max_nodes are reduced to their max_nodes highest-degree nodes.
+    """
     if graph is None: 
         return
     print(f"Generating FULL graph visualization: {output_image_filename}...")
-    plt.figure(figsize=(25, 15)) 
     
     for node, data in graph.nodes(data=True):
         if node == 'SOURCE': 
             data['layer'] = 0
         elif node == 'SINK': 
             data['layer'] = 5
+        if 'sort_val' not in data:
+            data['sort_val'] = data.get('value', 0) if isinstance(data.get('value'), (int, float)) else 0
     
-    try:
-        for n, d in graph.nodes(data=True):
-            if 'sort_val' not in d:
-                d['sort_val'] = d.get('value', 0) if isinstance(d.get('value'), (int, float)) else 0
-        pos = _deterministic_layout(graph)
-    except:
-        pos = nx.spring_layout(graph, seed=42)
-        
-    nx.draw_networkx_nodes(graph, pos, node_size=500, node_color='lightblue', alpha=0.6)
-    nx.draw_networkx_edges(graph, pos, edge_color='gray', alpha=0.2, arrows=False) 
-    plt.title("Full Master Graph Visualization", fontsize=16)
-    plt.axis('off')
-    plt.tight_layout()
-    plt.savefig(output_image_filename)
-    plt.close() 
-    print(f"Full graph saved.")
+    title = "Full Master Graph Visualization"
+    n_total = graph.number_of_nodes()
+    if max_nodes is not None and n_total > max_nodes:
+        graph = graph.subgraph(_top_degree_nodes(graph, max_nodes))
+        title += f" (top {max_nodes} of {n_total} nodes by degree)"
+    
+    # Thousands of overlapping markers are illegible anyway: rasterize them and save at 100 DPI
+    large = graph.number_of_nodes() > _FULL_GRAPH_LARGE_NODES
+    dpi = 100 if large else 150
+    
+    # Same dataset and savefig settings -> same image -> reuse the previous render
+    cache_path = _full_graph_cache_path(graph, title, dpi)
+    if os.path.exists(cache_path):
+        try:
+            shutil.copyfile(cache_path, output_image_filename)
+            print("Full graph unchanged, reused cached render.")
+            return
+        except OSError:
+            pass  # cache entry vanished or is unreadable: render it again
+    
+    fig = Figure(figsize=(25, 15))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    
+    pos = _full_graph_layout(graph)
+    
+    nodes = nx.draw_networkx_nodes(graph, pos, ax=ax, node_size=500, node_color='lightblue', alpha=0.6)
+    nodes.set_rasterized(large)
+    if graph.number_of_edges():
+        segments = np.array([(pos[u], pos[v]) for u, v in graph.edges()])
+        _add_edge_collection(ax, segments, colors='gray', linewidths=1.0,
+                             alpha=0.2, zorder=1, rasterized=large)
+    ax.set_title(title, fontsize=16)
+    ax.axis('off')
+    fig.subplots_adjust(**_FULL_GRAPH_MARGINS)
+    fig.savefig(output_image_filename, dpi=dpi, **config.SAVEFIG_KWARGS)
+    _store_full_graph_cache(output_image_filename, cache_path)
+    print("Full graph saved.")
@@ -3,9 +3,162 @@ Heatmap visualization module for solution space analysis.
 Generates interactive (HTML) and static (PNG) heatmaps.
 """
 from collections import defaultdict
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')  # batch rendering only
+import matplotlib.colors as mcolors
 import matplotlib.patheffects as path_effects
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import PathCollection
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
+from matplotlib.lines import Line2D
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D, IdentityTransform
+import numpy as np
 import os
+import weakref
+import config
+
+# From this many (temp, time) points the interactive heatmap renders through WebGL
+_WEBGL_MIN_POINTS = 1000
+
+# From this many points heatmaps aggregate into bins instead of drawing one marker per point
+_DENSE_MIN_POINTS = 10000
+_DENSE_GRID = (200, 150)  # temperature x time bins of the interactive grid
+_DENSE_HEXBIN_GRIDSIZE = 60  # hexagons across the static plots
+
+# Hover layouts filled in by plotly from per-point customdata (values pre-formatted in Python)
+_SINGLE_HOVER = ("Steel: %{customdata[0]}<br>"
+                 "Temp: %{customdata[1]}°C<br>"
+                 "Time: %{customdata[2]}s<br>"
+                 "Hardness: %{customdata[3]} HRC<extra></extra>")
+_MULTI_HOVER = ("<b>Multiple Steels (%{customdata[0]})</b><br>"
+                "Temp: %{customdata[1]}°C<br>"
+                "Time: %{customdata[2]}s<br>"
+                "Avg Hardness: %{customdata[3]} HRC<br>"
+                "Steels:<br>%{customdata[4]}<extra></extra>")
+
+# Extracted points per graph object, shared by the interactive and static heatmaps
+_POINTS_CACHE = weakref.WeakKeyDictionary()
+
+
+def _aggregate_points(temps, times, steels, hards):
+    """
+    Groups flat heatmap entries by (temp, time) with NumPy instead of a dict of lists.
+    
+    Groups keep first-appearance order and the original key values. Returns a dict with:
+        coords: list of (temp, time) per group
+        first: index of each group's first entry
+        avg: mean hardness per group (summed in entry order)
+        n_steels: number of distinct steels per group
+        steel_start, steels, hards: distinct steels of all groups, sorted by name
+            within each group and starting at steel_start[g] (last duplicate wins)
+    """
+    keys = np.column_stack([np.asarray(temps, dtype=np.float64),
+                            np.asarray(times, dtype=np.float64)])
+    _, first_sorted, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    
+    # np.unique numbers groups in sorted key order; renumber them by first appearance
+    appearance = np.argsort(first_sorted, kind='stable')
+    renumber = np.empty_like(appearance)
+    renumber[appearance] = np.arange(len(appearance))
+    gid = renumber[inverse.ravel()]
+    first = first_sorted[appearance]
+    n_groups = len(first)
+    
+    hard_arr = np.asarray(hards, dtype=np.float64)
+    sizes = np.bincount(gid, minlength=n_groups)
+    avg = np.bincount(gid, weights=hard_arr, minlength=n_groups) / sizes
+    
+    # One stable (group, steel) sort; the last entry of each run is the surviving duplicate
+    steel_arr = np.asarray(steels)
+    order = np.lexsort((steel_arr, gid))
+    ord_g, ord_s = gid[order], steel_arr[order]
+    run_end = np.r_[(ord_g[1:] != ord_g[:-1]) | (ord_s[1:] != ord_s[:-1]), True]
+    uniq = order[run_end]
+    n_steels = np.bincount(gid[uniq], minlength=n_groups)
+    
+    return {
+        'coords': [(temps[i], times[i]) for i in first.tolist()],
+        'first': first.tolist(),
+        'avg': avg.tolist(),
+        'n_steels': n_steels.tolist(),
+        'steel_start': np.r_[0, np.cumsum(n_steels)[:-1]].tolist(),
+        'steels': steel_arr[uniq].tolist(),
+        'hards': hard_arr[uniq].tolist(),
+    }
+
+
+def _extract_heatmap_points(graph):
+    """
+    Collects one (temp, time, steel, hardness) entry per temp node by following
+    temp -> time -> steel and temp -> hardness through the first neighbours.
+    
+    Returns (temps, times, steels, hards, groups), where groups is the
+    _aggregate_points result (None if there are no points). Memoized per graph
+    object; the entry is rebuilt if the node or edge count changed.
+    """
+    stamp = (graph.number_of_nodes(), graph.number_of_edges())
+    cached = _POINTS_CACHE.get(graph)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    
+    # First predecessor/successor of every node, read once from the adjacency
+    # (same picks as list(graph.predecessors(n))[0] / list(graph.successors(n))[0])
+    first_pred = {n: next(iter(nbrs)) for n, nbrs in graph.pred.items() if nbrs}
+    first_succ = {n: next(iter(nbrs)) for n, nbrs in graph.succ.items() if nbrs}
+    node_data = graph.nodes
+    
+    temps, times, steels, hards = [], [], [], []
+    
+    for node, data in graph.nodes(data=True):
+        if data.get('type') != 'temp':
+            continue
+        
+        time_node = first_pred.get(node)
+        hard_node = first_succ.get(node)
+        if time_node is None or hard_node is None:
+            continue
+        steel_node = first_pred.get(time_node)
+        if steel_node is None:
+            continue
+        
+        temp_val = data.get('value')
+        time_val = node_data[time_node].get('value')
+        if temp_val is not None and time_val is not None:
+            temps.append(temp_val)
+            times.append(time_val)
+            steels.append(node_data[steel_node].get('steel_type', str(steel_node)))
+            hards.append(node_data[hard_node].get('value'))
+    
+    groups = _aggregate_points(temps, times, steels, hards) if temps else None
+    result = (temps, times, steels, hards, groups)
+    _POINTS_CACHE[graph] = (stamp, result)
+    return result
+
+
+def _binned_hardness_trace(go, temps, times, hards):
+    """
+    Aggregates all entries into a regular temperature x time grid and returns a
+    go.Heatmap of the mean hardness per cell (empty cells stay transparent).
+    """
+    temps = np.asarray(temps, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+    hards = np.asarray(hards, dtype=np.float64)
+    
+    counts, x_edges, y_edges = np.histogram2d(temps, times, bins=_DENSE_GRID)
+    sums, _, _ = np.histogram2d(temps, times, bins=[x_edges, y_edges], weights=hards)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(counts > 0, sums / counts, np.nan)
+    
+    return go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2, z=mean.T,
+        coloraxis='coloraxis', name='Binned Solutions', showlegend=True,
+        hovertemplate="Temp: %{x:.0f}°C<br>Time: %{y:.0f}s<br>"
+                      "Mean Hardness: %{z:.1f} HRC<extra></extra>"
+    )
 
 
 def plot_interactive_heatmap(graph, output_filename, highlight_points=None, auto_open=False):
@@ -21,147 +174,100 @@ def plot_interactive_heatmap(graph, output_filename, highlight_points=None, auto
 
     print(f"Generating interactive heatmap: {output_filename}...")
     
-    points_data = defaultdict(list)
-    
-    for node, data in graph.nodes(data=True):
-        if data.get('type') == 'temp':
-            temp_val = data.get('value')
-            
-            try:
-                preds = list(graph.predecessors(node))
-                if not preds: continue
-                time_node = preds[0]
-                time_val = graph.nodes[time_node].get('value')
-                
-                steel_preds = list(graph.predecessors(time_node))
-                if not steel_preds: continue
-                steel_node = steel_preds[0]
-                steel_name = graph.nodes[steel_node].get('steel_type', str(steel_node))
-                
-                succs = list(graph.successors(node))
-                if not succs: continue
-                hard_node = succs[0]
-                hard_val = graph.nodes[hard_node].get('value')
-                
-                if temp_val is not None and time_val is not None:
-                    points_data[(temp_val, time_val)].append({
-                        'steel': steel_name,
-                        'hardness': hard_val
-                    })
-                    
-            except Exception:
-                continue
+    temps, times, steels, hards, groups = _extract_heatmap_points(graph)
 
-    if not points_data:
+    if not temps:
         print("WARNING: No valid data points found for heatmap (Graph might be empty).")
         return
 
     optimal_coords = set(highlight_points) if highlight_points else set()
     
-    single_temps, single_times, single_hardnesses, single_hovers = [], [], [], []
-    multi_temps, multi_times, multi_hardnesses, multi_hovers = [], [], [], []
+    first_idx, avg_h, n_unique = groups['first'], groups['avg'], groups['n_steels']
+    uniq_start, uniq_steels, uniq_hards = groups['steel_start'], groups['steels'], groups['hards']
+    
+    # Very dense solution spaces are drawn as a binned grid; only optimal points stay markers
+    dense = len(avg_h) >= _DENSE_MIN_POINTS
+    
+    single_temps, single_times, single_hardnesses, single_data = [], [], [], []
+    multi_temps, multi_times, multi_hardnesses, multi_data = [], [], [], []
     opt_temps, opt_times, opt_hardnesses, opt_hovers = [], [], [], []
     
-    for (temp, time), items in points_data.items():
-        avg_hardness = sum(item['hardness'] for item in items) / len(items)
-        
-        unique_steels = {}
-        for item in items:
-            unique_steels[item['steel']] = item['hardness']
+    # Only the varying fields are stored per point; plotly assembles the hover
+    # from the trace's hovertemplate. Optimal points (a handful) keep full text.
+    for g, (temp, time) in enumerate(groups['coords']):
+        avg_hardness = avg_h[g]
+        n_steels = n_unique[g]
+        is_opt = (temp, time) in optimal_coords
+        if dense and not is_opt:
+            continue
             
-        if len(unique_steels) == 1:
-            item = items[0]
-            hover_text = (
-                f"Steel: {item['steel']}<br>"
-                f"Temp: {temp}°C<br>"
-                f"Time: {time}s<br>"
-                f"Hardness: {item['hardness']:.1f} HRC"
-            )
+        if n_steels == 1:
+            first = first_idx[g]
+            fields = [steels[first], f"{temp}", f"{time}", f"{hards[first]:.1f}"]
+            template = _SINGLE_HOVER
         else:
-            sorted_steels = sorted(unique_steels.items())
-            if len(sorted_steels) > 15:
-                steels_list = "<br>".join([f"  • {s}: {h:.1f} HRC" for s, h in sorted_steels[:15]])
-                steels_list += f"<br>  ... and {len(sorted_steels)-15} more"
-            else:
-                steels_list = "<br>".join([f"  • {s}: {h:.1f} HRC" for s, h in sorted_steels])
-                
-            hover_text = (
-                f"<b>Multiple Steels ({len(unique_steels)})</b><br>"
-                f"Temp: {temp}°C<br>"
-                f"Time: {time}s<br>"
-                f"Avg Hardness: {avg_hardness:.1f} HRC<br>"
-                f"Steels:<br>{steels_list}"
-            )
+            start = uniq_start[g]
+            shown = min(n_steels, 15)
+            steels_list = "<br>".join([f"  • {uniq_steels[k]}: {uniq_hards[k]:.1f} HRC"
+                                       for k in range(start, start + shown)])
+            if n_steels > 15:
+                steels_list += f"<br>  ... and {n_steels-15} more"
+            fields = [n_steels, f"{temp}", f"{time}", f"{avg_hardness:.1f}", steels_list]
+            template = _MULTI_HOVER
         
-        if (temp, time) in optimal_coords:
+        if is_opt:
             opt_temps.append(temp)
             opt_times.append(time)
             opt_hardnesses.append(avg_hardness)
-            opt_hover_text = f"<b>⭐ OPTIMAL SOLUTION ⭐</b><br>{hover_text}"
-            opt_hovers.append(opt_hover_text)
-        elif len(unique_steels) > 1:
+            hover_text = template.replace("<extra></extra>", "")
+            for k, value in enumerate(fields):
+                hover_text = hover_text.replace(f"%{{customdata[{k}]}}", str(value))
+            opt_hovers.append(f"<b>⭐ OPTIMAL SOLUTION ⭐</b><br>{hover_text}")
+        elif n_steels > 1:
             multi_temps.append(temp)
             multi_times.append(time)
             multi_hardnesses.append(avg_hardness)
-            multi_hovers.append(hover_text)
+            multi_data.append(fields)
         else:
             single_temps.append(temp)
             single_times.append(time)
             single_hardnesses.append(avg_hardness)
-            single_hovers.append(hover_text)
+            single_data.append(fields)
     
-    all_hardnesses = single_hardnesses + multi_hardnesses + opt_hardnesses
-    vmin, vmax = (min(all_hardnesses), max(all_hardnesses)) if all_hardnesses else (0, 100)
+    vmin, vmax = min(avg_h), max(avg_h)
     
-    import plotly.graph_objects as go
+    # SVG scatter is crisper for small point sets; WebGL keeps large ones responsive
+    scatter_trace = go.Scattergl if len(groups['coords']) >= _WEBGL_MIN_POINTS else go.Scatter
     fig = go.Figure()
     
+    if dense:
+        fig.add_trace(_binned_hardness_trace(go, temps, times, hards))
+    
     if single_temps:
-        fig.add_trace(go.Scatter(
+        fig.add_trace(scatter_trace(
             x=single_temps, y=single_times, mode='markers',
             marker=dict(size=12, symbol='circle', color=single_hardnesses, 
-                       colorscale='RdYlBu_r', cmin=vmin, cmax=vmax,
-                       showscale=True, 
-                       colorbar=dict(
-                           title="Hardness (HRC)",
-                           x=1.02,
-                           xanchor='left'
-                       )),
-            text=single_hovers, hovertemplate='%{text}<extra></extra>', 
+                       coloraxis='coloraxis'),
+            customdata=single_data, hovertemplate=_SINGLE_HOVER, 
             name='Single Steel',
             showlegend=True
         ))
     
     if multi_temps:
-        show_scale = not single_temps
-        fig.add_trace(go.Scatter(
+        fig.add_trace(scatter_trace(
             x=multi_temps, y=multi_times, mode='markers',
             marker=dict(size=14, symbol='square', color=multi_hardnesses, 
-                       colorscale='RdYlBu_r', cmin=vmin, cmax=vmax,
-                       showscale=show_scale, line=dict(width=1, color='white'),
-                       colorbar=dict(
-                           title="Hardness (HRC)",
-                           x=1.02,
-                           xanchor='left'
-                       ) if show_scale else None),
-            text=multi_hovers, hovertemplate='%{text}<extra></extra>', 
+                       coloraxis='coloraxis', line=dict(width=1, color='white')),
+            customdata=multi_data, hovertemplate=_MULTI_HOVER, 
             name='Multiple Steels',
             showlegend=True
         ))
     
     if opt_temps:
-        show_colorbar_on_optimal = not single_temps and not multi_temps
-        fig.add_trace(go.Scatter(
+        fig.add_trace(scatter_trace(
             x=opt_temps, y=opt_times, mode='markers',
             marker=dict(size=22, symbol='star', color=opt_hardnesses, 
-                       colorscale='RdYlBu_r', cmin=vmin, cmax=vmax,
-                       line=dict(width=2, color='black'),
-                       showscale=show_colorbar_on_optimal,
-                       colorbar=dict(
-                           title="Hardness (HRC)",
-                           x=1.02,
-                           xanchor='left'
-                       ) if show_colorbar_on_optimal else None),
+                       coloraxis='coloraxis', line=dict(width=2, color='black')),
             text=opt_hovers, hovertemplate='%{text}<extra></extra>', 
             name='Optimal',
             showlegend=True
@@ -174,6 +280,17 @@ def plot_interactive_heatmap(graph, output_filename, highlight_points=None, auto
             xanchor='center',
             font=dict(size=16)
         ),
+        # One shared colour axis: the scale and colorbar are serialised once, not per trace
+        coloraxis=dict(
+            colorscale='RdYlBu_r',
+            cmin=vmin,
+            cmax=vmax,
+            colorbar=dict(
+                title="Hardness (HRC)",
+                x=1.02,
+                xanchor='left'
+            )
+        ),
         xaxis_title="Temperature (°C)", 
         yaxis_title="Time (s)",
         template='plotly_white', 
@@ -197,13 +314,38 @@ def plot_interactive_heatmap(graph, output_filename, highlight_points=None, auto
         autosize=False
     )
     
-    fig.write_html(output_filename, config={'displayModeBar': True})
+    # plotly.js is loaded from the CDN instead of being inlined (~4.7 MB) in every page
+    fig.write_html(output_filename, include_plotlyjs='cdn', config={'displayModeBar': True})
     print(f"✓ Interactive heatmap saved: {output_filename}")
     if auto_open:
         import webbrowser
         webbrowser.open(f"file://{os.path.abspath(output_filename)}")
 
 
+def _draw_count_glyphs(ax, xs, ys, counts, fontsize, zorder):
+    """
+    Draws bold white count labels with a black outline at each (x, y).
+    Each distinct count is rendered once as a centred TextPath and all labels
+    go into a single PathCollection instead of one Text artist per point.
+    """
+    prop = FontProperties(weight='bold')
+    glyphs = {}
+    for count in set(counts):
+        glyph = TextPath((0, 0), str(count), size=fontsize, prop=prop)
+        extents = glyph.get_extents()
+        glyphs[count] = glyph.transformed(
+            Affine2D().translate(-(extents.x0 + extents.x1) / 2, -(extents.y0 + extents.y1) / 2))
+
+    # Glyph paths are in points; a size of 1 makes the collection scale them by dpi/72
+    collection = PathCollection([glyphs[c] for c in counts], sizes=[1.0],
+                                offsets=np.column_stack([xs, ys]), offset_transform=ax.transData,
+                                transform=IdentityTransform(),
+                                facecolors='white', edgecolors='none', zorder=zorder)
+    collection.set_path_effects([path_effects.withStroke(linewidth=2, foreground='black')])
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+
 def plot_static_heatmap(graph, output_filename, highlight_points=None, dpi=300):
     """
     Generates a high-resolution static PNG heatmap for scientific publications.
@@ -216,41 +358,9 @@ def plot_static_heatmap(graph, output_filename, highlight_points=None, dpi=300):
     """
     print(f"Generating publication-quality static heatmap: {output_filename}...")
     
-    points_data = defaultdict(list)
-    
-    for node, data in graph.nodes(data=True):
-        if data.get('type') == 'temp':
-            temp_val = data.get('value')
-            
-            try:
-                preds = list(graph.predecessors(node))
-                if not preds: 
-                    continue
-                time_node = preds[0]
-                time_val = graph.nodes[time_node].get('value')
-                
-                steel_preds = list(graph.predecessors(time_node))
-                if not steel_preds: 
-                    continue
-                steel_node = steel_preds[0]
-                steel_name = graph.nodes[steel_node].get('steel_type', str(steel_node))
-                
-                succs = list(graph.successors(node))
-                if not succs: 
-                    continue
-                hard_node = succs[0]
-                hard_val = graph.nodes[hard_node].get('value')
-                
-                if temp_val is not None and time_val is not None:
-                    points_data[(temp_val, time_val)].append({
-                        'steel': steel_name,
-                        'hardness': hard_val
-                    })
-                    
-            except Exception:
-                continue
+    temps, times, steels, hards, groups = _extract_heatmap_points(graph)
 
-    if not points_data:
+    if not temps:
         print("WARNING: No valid data points found for static heatmap.")
         return
 
@@ -260,19 +370,16 @@ def plot_static_heatmap(graph, output_filename, highlight_points=None, dpi=300):
     multi_x, multi_y, multi_c, multi_count = [], [], [], []
     opt_x, opt_y, opt_c = [], [], []
     
-    for (temp, time), items in points_data.items():
-        avg_hardness = sum(item['hardness'] for item in items) / len(items)
-        unique_steels = {item['steel']: item['hardness'] for item in items}
-        
+    for (temp, time), avg_hardness, n_steels in zip(groups['coords'], groups['avg'], groups['n_steels']):
         if (temp, time) in optimal_coords:
             opt_x.append(temp)
             opt_y.append(time)
             opt_c.append(avg_hardness)
-        elif len(unique_steels) > 1:
+        elif n_steels > 1:
             multi_x.append(temp)
             multi_y.append(time)
             multi_c.append(avg_hardness)
-            multi_count.append(len(unique_steels))
+            multi_count.append(n_steels)
         else:
             single_x.append(temp)
             single_y.append(time)
@@ -285,40 +392,44 @@ def plot_static_heatmap(graph, output_filename, highlight_points=None, dpi=300):
     
     vmin, vmax = min(all_hardnesses) - 1, max(all_hardnesses) + 1
     
-    fig, ax = plt.subplots(figsize=(12, 9))
-    
-    if single_x:
-        sc1 = ax.scatter(single_x, single_y, c=single_c, 
-                        cmap='RdYlBu_r', s=150, marker='o',
-                        edgecolors='gray', linewidths=0.5, alpha=0.85,
-                        vmin=vmin, vmax=vmax, label='Single Steel', zorder=2)
+    # Map hardness to RGBA once; scatters get explicit colours and skip their own norm/cmap pass
+    norm = mcolors.Normalize(vmin=vmin, vmax=vmax)
+    cmap = colormaps['RdYlBu_r']
+    
+    # Figure lives on its own Agg canvas, outside pyplot's global figure registry
+    fig = Figure(figsize=(12, 9), constrained_layout=True)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    
+    if len(single_x) >= _DENSE_MIN_POINTS:
+        ax.hexbin(single_x, single_y, C=single_c, reduce_C_function=np.mean,
+                  gridsize=_DENSE_HEXBIN_GRIDSIZE, cmap=cmap, norm=norm,
+                  edgecolors='face', alpha=0.85, label='Single Steel', zorder=2)
+    elif single_x:
+        ax.scatter(single_x, single_y, c=cmap(norm(np.asarray(single_c))), 
+                   s=150, marker='o',
+                   edgecolors='gray', linewidths=0.5, alpha=0.85,
+                   label='Single Steel', zorder=2)
     
     if multi_x:
-        sc2 = ax.scatter(multi_x, multi_y, c=multi_c, 
-                        cmap='RdYlBu_r', s=180, marker='s',
-                        edgecolors='black', linewidths=1.0, alpha=0.85,
-                        vmin=vmin, vmax=vmax, label='Multiple Steels', zorder=3)
+        ax.scatter(multi_x, multi_y, c=cmap(norm(np.asarray(multi_c))), 
+                   s=180, marker='s',
+                   edgecolors='black', linewidths=1.0, alpha=0.85,
+                   label='Multiple Steels', zorder=3)
         
-        for x, y, count in zip(multi_x, multi_y, multi_count):
-            text = ax.text(x, y, str(count), fontsize=9, fontweight='bold',
-                          color='white', ha='center', va='center', zorder=4)
-            text.set_path_effects([path_effects.withStroke(linewidth=2, foreground='black')])
+        _draw_count_glyphs(ax, multi_x, multi_y, multi_count, fontsize=9, zorder=4)
     
     if opt_x:
-        sc3 = ax.scatter(opt_x, opt_y, c=opt_c,
-                  cmap='RdYlBu_r', s=400, marker='*',
-                  edgecolors='black', linewidths=2.5, alpha=1.0,
-                  vmin=vmin, vmax=vmax, label='Optimal Solution', zorder=5)
+        ax.scatter(opt_x, opt_y, c=cmap(norm(np.asarray(opt_c))),
+                   s=400, marker='*',
+                   edgecolors='black', linewidths=2.5, alpha=1.0,
+                   label='Optimal Solution', zorder=5)
     
     if single_x or multi_x or opt_x:
-        if single_x:
-            colorbar_source = sc1
-        elif multi_x:
-            colorbar_source = sc2
-        else:
-            colorbar_source = sc3
-        
-        cbar = plt.colorbar(colorbar_source, ax=ax, pad=0.02)
+        # Colorbar keeps the alpha of the scatter it used to be built from
+        cbar_alpha = 0.85 if (single_x or multi_x) else 1.0
+        cbar = fig.colorbar(ScalarMappable(norm=norm, cmap=cmap), ax=ax, pad=0.02,
+                            alpha=cbar_alpha)
         cbar.set_label('Final Hardness (HRC)', rotation=270, labelpad=20, fontsize=12, fontweight='bold')
         cbar.ax.tick_params(labelsize=10)
     
@@ -336,11 +447,8 @@ def plot_static_heatmap(graph, output_filename, highlight_points=None, dpi=300):
     
     ax.tick_params(axis='both', which='major', labelsize=11)
     
-    plt.tight_layout()
-    
-    plt.savefig(output_filename, dpi=dpi, bbox_inches='tight', 
-                facecolor='white', edgecolor='none')
-    plt.close()
+    fig.savefig(output_filename, dpi=dpi, bbox_inches='tight', 
+                facecolor='white', edgecolor='none', **config.SAVEFIG_KWARGS)
     
     print(f"✓ Static heatmap saved at {dpi} DPI: {output_filename}")
 
@@ -367,50 +475,68 @@ def _plot_matplotlib_heatmap_fallback(graph, output_filename, highlight_points):
     if not points_agg:
         return
 
-    single_x, single_y, single_c = [], [], []
-    multi_x, multi_y, multi_count = [], [], []
-    all_hardnesses = []
-
-    for (temp, time), h_list in points_agg.items():
-        all_hardnesses.extend(h_list)
-        if len(h_list) == 1:
-            single_x.append(temp)
-            single_y.append(time)
-            single_c.append(h_list[0])
-        else:
-            multi_x.append(temp)
-            multi_y.append(time)
-            multi_count.append(len(h_list))
+    coords = np.array(list(points_agg.keys()), dtype=np.float64)
+    counts = np.fromiter((len(h) for h in points_agg.values()), dtype=np.int64, count=len(points_agg))
+    first_h = np.fromiter((h[0] for h in points_agg.values()), dtype=np.float64, count=len(points_agg))
+    all_hardnesses = [h for h_list in points_agg.values() for h in h_list]
+    is_multi = counts > 1
 
     min_h, max_h = (min(all_hardnesses)-1, max(all_hardnesses)+1) if all_hardnesses else (0, 65)
 
-    plt.figure(figsize=(10, 8))
-    
-    if single_x:
-        sc = plt.scatter(single_x, single_y, c=single_c, cmap='RdYlBu_r', 
-                         s=100, edgecolors='gray', alpha=0.9, 
-                         vmin=min_h, vmax=max_h, label='Single Steel', zorder=1)
-        plt.colorbar(sc).set_label('Final Hardness (HRC)', rotation=270, labelpad=15)
-    
-    if multi_x:
-        plt.scatter(multi_x, multi_y, c='#A9A9A9', s=120, edgecolors='black', 
-                   alpha=0.8, label='Multi-Steel', zorder=2)
-        for x, y, count in zip(multi_x, multi_y, multi_count):
-            text = plt.text(x, y, str(count), fontsize=7, fontweight='bold', 
-                          color='white', ha='center', va='center', zorder=3)
-            text.set_path_effects([path_effects.withStroke(linewidth=2, foreground='black')])
+    # Single- and multi-steel points share one scatter call: colours, sizes and
+    # edges are resolved up front (singles first so multi markers stay on top)
+    order = np.argsort(is_multi, kind='stable')
+    norm = mcolors.Normalize(vmin=min_h, vmax=max_h)
+    cmap = colormaps['RdYlBu_r']
+    rgba = cmap(norm(first_h))
+    rgba[:, 3] = 0.9
+    rgba[is_multi] = mcolors.to_rgba('#A9A9A9', alpha=0.8)
+    sizes = np.where(is_multi, 120, 100)
+    edges = np.where(is_multi[:, None], mcolors.to_rgba('black', 0.8), mcolors.to_rgba('gray', 0.9))
+
+    fig = Figure(figsize=(10, 8), constrained_layout=True)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    
+    if (~is_multi).sum() >= _DENSE_MIN_POINTS:
+        # Dense single-steel points are aggregated into hexagons; multi-steel bins stay markers
+        single_xy = coords[~is_multi]
+        ax.hexbin(single_xy[:, 0], single_xy[:, 1], C=first_h[~is_multi], reduce_C_function=np.mean,
+                  gridsize=_DENSE_HEXBIN_GRIDSIZE, cmap=cmap, norm=norm, edgecolors='face',
+                  alpha=0.9, zorder=1)
+        order = order[is_multi[order]]
+    ax.scatter(coords[order, 0], coords[order, 1], c=rgba[order], s=sizes[order],
+               edgecolors=edges[order], zorder=1)
+    legend_handles = []
+    
+    if not is_multi.all():
+        # Colorbar keeps the alpha of the single-steel scatter it used to be built from
+        sm = ScalarMappable(norm=norm, cmap=cmap)
+        fig.colorbar(sm, ax=ax, alpha=0.9).set_label('Final Hardness (HRC)', rotation=270, labelpad=15)
+        # Matches the legend of the colour-mapped scatter this replaced: first point's colour, alpha 0.9
+        legend_handles.append(Line2D([], [], linestyle='none', marker='o', markersize=10,
+                                     markerfacecolor=rgba[~is_multi][0],
+                                     markeredgecolor=mcolors.to_rgba('gray', 0.9),
+                                     label='Single Steel'))
+    
+    if is_multi.any():
+        legend_handles.append(Line2D([], [], linestyle='none', marker='o', markersize=11,
+                                     markerfacecolor='#A9A9A9', markeredgecolor='black',
+                                     alpha=0.8, label='Multi-Steel'))
+        multi_xy = coords[is_multi]
+        _draw_count_glyphs(ax, multi_xy[:, 0], multi_xy[:, 1], counts[is_multi].tolist(),
+                           fontsize=7, zorder=3)
 
     if highlight_points:
         opt_x, opt_y = zip(*set(highlight_points)) if highlight_points else ([], [])
-        plt.scatter(opt_x, opt_y, s=300, facecolors='none',
-                   edgecolors='lime', linewidths=4, label='Optimal', zorder=10)
+        opt = ax.scatter(opt_x, opt_y, s=300, facecolors='none',
+                         edgecolors='lime', linewidths=4, label='Optimal', zorder=10)
+        legend_handles.append(opt)
 
-    plt.title('Solution Space Heatmap\n(Install Plotly for interactive version)', fontsize=14)
-    plt.xlabel('Tempering Temperature (°C)', fontsize=12)
-    plt.ylabel('Tempering Time (s)', fontsize=12)
-    plt.legend()
-    plt.grid(True, linestyle='--', alpha=0.5)
-    plt.tight_layout()
-    plt.savefig(output_filename, dpi=300, bbox_inches='tight')
-    plt.close()
+    ax.set_title('Solution Space Heatmap\n(Install Plotly for interactive version)', fontsize=14)
+    ax.set_xlabel('Tempering Temperature (°C)', fontsize=12)
+    ax.set_ylabel('Tempering Time (s)', fontsize=12)
+    ax.legend(handles=legend_handles)
+    ax.grid(True, linestyle='--', alpha=0.5)
+    fig.savefig(output_filename, dpi=300, bbox_inches='tight', **config.SAVEFIG_KWARGS)
     print(f"Static heatmap saved: {output_filename}")
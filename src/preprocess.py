@@ -2,9 +2,130 @@
 Data preprocessing module for steel heat treatment data.
 Handles ETL (Extract, Transform, Load) operations on raw CSV data.
 """
+import json
+import os
 import pandas as pd
 import config
 
+# Raw columns not used by the graph (initial hardness is incomplete, source is bibliographic)
+_COLUMNS_TO_DROP = ('Initial hardness (HRC) - post quenching', 'Source')
+
+# Raw files above this size are parsed in chunks so peak memory stays bounded
+_CHUNKED_READ_MIN_BYTES = 256 * 1024 * 1024
+_READ_CHUNK_ROWS = 100_000
+
+# Bump when the ETL output changes so existing processed files are rebuilt
+_ETL_VERSION = 1
+
+# Columns the graph construction cannot work without (resolved once at import)
+_REQUIRED_COLUMNS = (
+    config.DB_CONFIG.COL_STEEL,
+    config.DB_CONFIG.COL_TIME,
+    config.DB_CONFIG.COL_TEMP,
+    config.DB_CONFIG.COL_HARDNESS
+)
+_KEY_COMPOSITION = config.DB_CONFIG.KEY_COMPOSITION
+
+def _etl_fingerprint():
+    """
+    Describes everything the processed file depends on: the raw file (mtime, size),
+    the column configuration and the ETL version.
+    """
+    raw = os.stat(config.RAW_DATA_PATH)
+    return {
+        'version': _ETL_VERSION,
+        'raw': [raw.st_mtime, raw.st_size],
+        'drop': list(_COLUMNS_TO_DROP),
+        'required': list(_REQUIRED_COLUMNS),
+        'composition_key': _KEY_COMPOSITION,
+    }
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_mtime, stat.st_size]
+
+def _is_up_to_date(fingerprint):
+    """
+    True if the processed file was written by a run with the same fingerprint
+    and has not been modified since.
+    """
+    try:
+        with open(config.PROCESSED_META_PATH, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return meta.get('inputs') == fingerprint and meta.get('output') == _file_stamp(config.PROCESSED_DATA_PATH)
+    except (OSError, ValueError, AttributeError):
+        return False
+
+def _write_meta(fingerprint):
+    try:
+        with open(config.PROCESSED_META_PATH, 'w', encoding='utf-8') as f:
+            json.dump({'inputs': fingerprint, 'output': _file_stamp(config.PROCESSED_DATA_PATH)}, f)
+    except OSError:
+        pass  # without the fingerprint the next run simply repeats the ETL
+
+def _run_etl(raw_path, out_path, drop_cols, required_cols):
+    """
+    Reads raw_path without drop_cols, validates required_cols and writes the
+    cleaned table to out_path (plus a Parquet copy next to it).
+    
+    Returns:
+        bool: True if the output was written, False if required columns are missing
+    """
+    # Unneeded columns are skipped by the parser instead of being read and dropped.
+    # This changes parsing: dropna(how='all') only sees the kept columns, so a row whose
+    # only values were in drop_cols is now removed. The raw file's data rows carry one
+    # more field than its 17-column header; pandas still takes that first field
+    # ("Author, year" -> author) as the implicit index with the callable in place, and
+    # the whole-line quoted rows still land in that index as all-NaN rows and are dropped.
+    skipped = set()
+    def keep_column(col):
+        if col.strip() in drop_cols:
+            skipped.add(col.strip())
+            return False
+        return True
+
+    read_kwargs = dict(header=0, encoding='utf-8', usecols=keep_column)
+    if os.path.getsize(raw_path) >= _CHUNKED_READ_MIN_BYTES:
+        # Empty rows are dropped per chunk, so only the kept rows are ever held together
+        chunks = [chunk.dropna(how='all')
+                  for chunk in pd.read_csv(raw_path, chunksize=_READ_CHUNK_ROWS, **read_kwargs)]
+        df_cleaned = pd.concat(chunks, ignore_index=True)
+    else:
+        df_cleaned = pd.read_csv(raw_path, **read_kwargs).dropna(how='all')
+    df_cleaned.columns = df_cleaned.columns.str.strip()
+
+    existing_columns_to_drop = [col for col in drop_cols if col in skipped]
+    if existing_columns_to_drop:
+        print(f"Columns removed: {existing_columns_to_drop}")
+    
+    missing_columns = list(pd.Index(required_cols).difference(df_cleaned.columns, sort=False))
+    if missing_columns:
+        print(f"ERROR: Missing required columns: {missing_columns}")
+        print(f"Available columns: {list(df_cleaned.columns)}")
+        return False
+    
+    comp_cols = [c for c in df_cleaned.columns if _KEY_COMPOSITION in c]
+    if not comp_cols:
+        print(f"WARNING: No composition columns found with pattern '{_KEY_COMPOSITION}'")
+        print(f"Available columns: {list(df_cleaned.columns)}")
+    else:
+        print(f"Found {len(comp_cols)} composition columns: {comp_cols}")
+    
+    if config.PIPELINE_DEBUG:
+        total_missing = int(df_cleaned.isna().to_numpy().sum())  # one reduction over the mask
+        if total_missing > 0:
+            print(f"\nWARNING: Found {total_missing} missing values (NaN).")
+
+    df_cleaned.to_csv(out_path, index=False, encoding='utf-8')
+    print(f"Processed file saved to: {out_path}")
+    
+    # Typed, compressed copy for graph construction; the CSV stays the readable artifact
+    try:
+        df_cleaned.to_parquet(os.path.splitext(out_path)[0] + '.parquet', index=False, compression='zstd')
+    except (ImportError, ValueError, TypeError, OSError) as e:
+        print(f"Parquet copy skipped ({e}); graph construction will read the CSV")
+    return True
+
 def main():
     """
     Executes the ETL pipeline:
@@ -13,48 +134,24 @@ def main():
     3. Validates required columns exist
     4. Saves processed data for graph construction
     
+    The whole ETL is skipped when the raw file and column settings match the
+    fingerprint stored with the last processed output.
+    
     Returns:
         bool: True if successful, False otherwise
     """
     print("--- Running Preprocessing (preprocess.py) ---")
     try:
-        df = pd.read_csv(config.RAW_DATA_PATH, header=0, encoding='utf-8')
-        df.columns = df.columns.str.strip()
-        df_cleaned = df.dropna(how='all')
-
-        columns_to_drop = ['Initial hardness (HRC) - post quenching', 'Source']
-        existing_columns_to_drop = [col for col in columns_to_drop if col in df_cleaned.columns]
-        
-        if existing_columns_to_drop:
-            df_cleaned = df_cleaned.drop(columns=existing_columns_to_drop)
-            print(f"Columns removed: {existing_columns_to_drop}")
+        fingerprint = _etl_fingerprint()
+        if _is_up_to_date(fingerprint):
+            print(f"Raw data and settings unchanged, reusing: {config.PROCESSED_DATA_PATH}")
+            return True
         
-        required_columns = [
-            config.DB_CONFIG.COL_STEEL,
-            config.DB_CONFIG.COL_TIME,
-            config.DB_CONFIG.COL_TEMP,
-            config.DB_CONFIG.COL_HARDNESS
-        ]
-        
-        missing_columns = [col for col in required_columns if col not in df_cleaned.columns]
-        if missing_columns:
-            print(f"ERROR: Missing required columns: {missing_columns}")
-            print(f"Available columns: {list(df_cleaned.columns)}")
+        if not _run_etl(config.RAW_DATA_PATH, config.PROCESSED_DATA_PATH,
+                        _COLUMNS_TO_DROP, _REQUIRED_COLUMNS):
             return False
         
-        comp_cols = [c for c in df_cleaned.columns if config.DB_CONFIG.KEY_COMPOSITION in c]
-        if not comp_cols:
-            print(f"WARNING: No composition columns found with pattern '{config.DB_CONFIG.KEY_COMPOSITION}'")
-            print(f"Available columns: {list(df_cleaned.columns)}")
-        else:
-            print(f"Found {len(comp_cols)} composition columns: {comp_cols}")
-        
-        total_missing = df_cleaned.isnull().sum().sum()
-        if total_missing > 0:
-            print(f"\nWARNING: Found {total_missing} missing values (NaN).")
-
-        df_cleaned.to_csv(config.PROCESSED_DATA_PATH, index=False, encoding='utf-8')
-        print(f"Processed file saved to: {config.PROCESSED_DATA_PATH}")
+        _write_meta(fingerprint)
         return True
 
     except FileNotFoundError:
@@ -3,6 +3,14 @@ Report generation module for optimization results.
 Creates technical reports in TXT format detailing query results.
 """
 
+# Display names for the graph's virtual endpoints
+_NAME_MAP = {'SOURCE': 'Start', 'SINK': 'End'}
+
+def _display_name(node):
+    """Node name without its '| id:n' suffix, with SOURCE/SINK shown as Start/End."""
+    clean_name = node.partition("|")[0].strip() if "|" in node else node
+    return _NAME_MAP.get(clean_name, clean_name)
+
 def generate_text_report(filepath, query_name, optimize_by, filters, result_data, alpha=0.5):
     """
     Writes a technical report to a TXT file.
@@ -24,71 +32,70 @@ def generate_text_report(filepath, query_name, optimize_by, filters, result_data
         status = "FAILURE"
         error_msg = result_data
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write("="*60 + "\n")
-        f.write(f"TECHNICAL REPORT: {query_name}\n")
-        f.write("="*60 + "\n\n")
-        
-        # Section 1: Search Parameters
-        f.write("1. SEARCH PARAMETERS\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Optimization Goal: {optimize_by.upper()} (Minimize)\n")
-        if optimize_by == 'balanced':
-            f.write(f"Alpha (Time Weight): {alpha}\n")
-            f.write(f"Beta (Temp Weight): {1-alpha:.1f}\n")
+    # Report is assembled in memory and written with a single call
+    parts = []
+    parts.append("="*60 + "\n")
+    parts.append(f"TECHNICAL REPORT: {query_name}\n")
+    parts.append("="*60 + "\n\n")
+    
+    # Section 1: Search Parameters
+    parts.append("1. SEARCH PARAMETERS\n")
+    parts.append("-" * 30 + "\n")
+    parts.append(f"Optimization Goal: {optimize_by.upper()} (Minimize)\n")
+    if optimize_by == 'balanced':
+        parts.append(f"Alpha (Time Weight): {alpha}\n")
+        parts.append(f"Beta (Temp Weight): {1-alpha:.1f}\n")
 
-        f.write("Filters Applied:\n")
-        for k, v in filters.items():
-            val_str = str(v)
-            if isinstance(v, dict):
-                if 'min' in v: 
-                    val_str = f"{v['min']} - {v['max']}"
-                elif 'op' in v: 
-                    val_str = f"{v['op']} {v['val']}"
-            f.write(f"  - {k}: {val_str}\n")
-        f.write("\n")
-        
-        # Section 2: Optimization Results
-        f.write("2. OPTIMIZATION RESULTS (DIJKSTRA)\n")
-        f.write("-" * 30 + "\n")
+    parts.append("Filters Applied:\n")
+    for k, v in filters.items():
+        val_str = str(v)
+        if isinstance(v, dict):
+            if 'min' in v: 
+                val_str = f"{v['min']} - {v['max']}"
+            elif 'op' in v: 
+                val_str = f"{v['op']} {v['val']}"
+        parts.append(f"  - {k}: {val_str}\n")
+    parts.append("\n")
+    
+    # Section 2: Optimization Results
+    parts.append("2. OPTIMIZATION RESULTS (DIJKSTRA)\n")
+    parts.append("-" * 30 + "\n")
+    
+    if status == "FAILURE":
+        parts.append(f"STATUS: NOT FOUND\n")
+        parts.append(f"Reason: {error_msg}\n")
+    else:
+        # Determine cost unit based on optimization type
+        unit = "s" if optimize_by == 'time' else "C" if optimize_by == 'temperature' else "(Score)"
+        parts.append(f"STATUS: {len(paths)} OPTIMAL SOLUTION(S) FOUND\n")
+        parts.append(f"Total Cost: {custo:.2f} {unit}\n\n")
         
-        if status == "FAILURE":
-            f.write(f"STATUS: NOT FOUND\n")
-            f.write(f"Reason: {error_msg}\n")
-        else:
-            # Determine cost unit based on optimization type
-            unit = "s" if optimize_by == 'time' else "C" if optimize_by == 'temperature' else "(Score)"
-            f.write(f"STATUS: {len(paths)} OPTIMAL SOLUTION(S) FOUND\n")
-            f.write(f"Total Cost: {custo:.2f} {unit}\n\n")
+        # Detail each solution option
+        for idx, (path, detalhes) in enumerate(zip(paths, details_list)):
+            parts.append(f"--- OPTION #{idx + 1} ---\n")
             
-            # Detail each solution option
-            for idx, (path, detalhes) in enumerate(zip(paths, details_list)):
-                f.write(f"--- OPTION #{idx + 1} ---\n")
-                
-                # Clean path node names for display
-                caminho_limpo = []
-                for node in path:
-                    clean_name = node.split("|")[0].strip() if "|" in node else node
-                    if clean_name == 'SOURCE': clean_name = 'Start'
-                    if clean_name == 'SINK': clean_name = 'End'
-                    caminho_limpo.append(clean_name)
-                
-                f.write("Process Flow:\n")
-                f.write(" -> ".join(caminho_limpo) + "\n\n")
-                
-                # Write steel specifications
-                f.write("Selected Steel Specs:\n")
-                f.write(f"  Steel Type:        {detalhes.get('Found Steel')}\n")
-                f.write(f"  Final Hardness:    {detalhes.get('Final Hardness (HRC)')} HRC\n")
-                f.write(f"  Temp Process:      {detalhes.get('Temp (C)')} C\n")
-                f.write(f"  Time Process:      {detalhes.get('Time (s)')} s\n")
-                
-                # Write composition if available
-                if 'Composition' in detalhes:
-                    f.write(f"  Composition (%):\n")
-                    for elem, qtd in detalhes['Composition'].items():
-                        cln = elem.replace(" (%wt)", "")
-                        f.write(f"    {cln:<4}: {qtd}\n")
-                f.write("\n")
-        
-        f.write("="*60 + "\n")
\ No newline at end of file
+            # Clean path node names for display
+            caminho_limpo = [_display_name(node) for node in path]
+            
+            parts.append("Process Flow:\n")
+            parts.append(" -> ".join(caminho_limpo) + "\n\n")
+            
+            # Write steel specifications
+            parts.append("Selected Steel Specs:\n")
+            parts.append(f"  Steel Type:        {detalhes.get('Found Steel')}\n")
+            parts.append(f"  Final Hardness:    {detalhes.get('Final Hardness (HRC)')} HRC\n")
+            parts.append(f"  Temp Process:      {detalhes.get('Temp (C)')} C\n")
+            parts.append(f"  Time Process:      {detalhes.get('Time (s)')} s\n")
+            
+            # Write composition if available
+            if 'Composition' in detalhes:
+                parts.append(f"  Composition (%):\n")
+                for elem, qtd in detalhes['Composition'].items():
+                    cln = elem.replace(" (%wt)", "")
+                    parts.append(f"    {cln:<4}: {qtd}\n")
+            parts.append("\n")
+    
+    parts.append("="*60 + "\n")
+
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(''.join(parts))
@@ -5,8 +5,8 @@ query execution, and output generation.
 """
 import os
 import json
-import glob
 import sys
+from concurrent.futures import ProcessPoolExecutor
 import config
 import preprocess
 from steel_graph import SteelGraph
@@ -16,19 +16,20 @@ from heatmap_plots import plot_interactive_heatmap, plot_static_heatmap
 from reporter import generate_text_report
 from generate_index import generate_index_html
 
+# Query schema checked by validate_query (invalid queries are skipped with a warning)
+_REQUIRED_QUERY_FIELDS = ('query_name', 'optimize_by', 'filters')
+_VALID_OPTIMIZATIONS = frozenset({'time', 'temperature', 'balanced'})
+
 def validate_query(query, index):
     """
     Validates query structure and parameters.
     """
-    required = ['query_name', 'optimize_by', 'filters']
-    
-    for key in required:
+    for key in _REQUIRED_QUERY_FIELDS:
         if key not in query:
             log_error(f"Query #{index}: Missing required field '{key}'", level='WARNING')
             return None
     
-    valid_optimizations = ['time', 'temperature', 'balanced']
-    if query['optimize_by'] not in valid_optimizations:
+    if query['optimize_by'] not in _VALID_OPTIMIZATIONS:
         log_error(f"Query #{index} ('{query['query_name']}'): Invalid optimize_by", level='WARNING')
         return None
     
@@ -42,9 +43,40 @@ def validate_query(query, index):
     return query
 
 
-def execute_query(graph, query, output_dir):
+def _silence_worker():
+    """Suppresses console output in plot worker processes, like the main process."""
+    sys.stdout = NullWriter()
+
+
+def _submit(pool, pending, label, func, *args):
+    """
+    Runs func(*args) in the plot worker pool, or inline when no pool is used.
+    Submitted jobs are tracked in pending as (label, future) pairs.
+    Failures are logged the same way in both modes.
+    """
+    if pool is None:
+        try:
+            func(*args)
+        except Exception as e:
+            log_error(f"Error rendering {label}: {e}")
+    else:
+        pending.append((label, pool.submit(func, *args)))
+
+
+def _wait_for_plots(pending):
+    """Waits for all submitted plot jobs and logs any that failed."""
+    for label, future in pending:
+        try:
+            future.result()
+        except Exception as e:
+            log_error(f"Error rendering {label}: {e}")
+    pending.clear()
+
+
+def execute_query(graph, query, output_dir, pool=None, pending=None):
     """
     Executes a complete query: runs algorithm, generates report and visualizations.
+    With a pool, visualizations are rendered by worker processes (tracked in pending).
     """
     nome = query['query_name']
     filtros = query['filters']
@@ -67,8 +99,11 @@ def execute_query(graph, query, output_dir):
     
     # Generate visualizations only if solution exists
     if success and grafo_podado and grafo_podado.number_of_nodes() > 0:
-        _generate_visualizations(output_dir, nome, paths, custo, optimize_by, 
-                                grafo_podado, details_list)
+        if pool is not None:
+            # The pruned graph is a subgraph view; workers need a picklable copy (same order)
+            grafo_podado = grafo_podado.copy()
+        _submit(pool, pending, f"visualizations for '{nome}'", _generate_visualizations,
+                output_dir, nome, paths, custo, optimize_by, grafo_podado, details_list)
     
     return success
 
@@ -145,24 +180,28 @@ def setup_environment():
             pass
     
     sys.stdout = NullWriter()  # Suppress console output
-    os.makedirs(config.OUTPUT_DIR, exist_ok=True)
     
     # Remove old output files
-    for ext in ["*.png", "*.jpg", "*.txt"]:
-        for f in glob.glob(os.path.join(config.OUTPUT_DIR, ext)):
-            try: 
-                os.remove(f)
-            except: 
-                pass
+    _clear_outputs(config.OUTPUT_DIR, ('.png', '.jpg', '.txt'))
     
     # Remove old HTML heatmaps from GitHub Pages directory
-    docs_heatmaps = os.path.join(os.getcwd(), 'docs', 'heatmaps')
-    os.makedirs(docs_heatmaps, exist_ok=True)
-    for f in glob.glob(os.path.join(docs_heatmaps, "*.html")):
-        try:
-            os.remove(f)
-        except:
-            pass
+    _clear_outputs(os.path.join(os.getcwd(), 'docs', 'heatmaps'), ('.html',))
+
+
+def _clear_outputs(directory, extensions):
+    """
+    Creates directory if needed and deletes the files in it ending with one of
+    extensions, using a single directory scan. Other files are left alone.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            # Same matches as glob('*.ext'): hidden files are skipped
+            if entry.name.endswith(extensions) and not entry.name.startswith('.') and entry.is_file():
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
 
 
 def load_queries():
@@ -173,8 +212,7 @@ def load_queries():
         list: List of query dictionaries, or empty list on error
     """
     try:
-        with open(config.QUERIES_PATH, 'r', encoding='utf-8') as f:
-            queries = json.load(f)
+        queries = config.load_queries()
         
         if not isinstance(queries, list):
             log_error("consultas.json must contain a list of queries")
@@ -222,27 +260,39 @@ def main():
         log_error(f"Graph construction failed: {e}")
         return False
     
-    print("\n" + "="*60)
-    print("STEP 3: FULL GRAPH VISUALIZATION")
-    print("="*60)
-    full_graph_path = os.path.join(config.OUTPUT_DIR, "full_graph.png")
-    plot_full_graph(graph.get_master_graph(), full_graph_path)
+    # Plots are independent CPU-bound renders: spread them over worker processes
+    pool = None
+    if config.PLOT_WORKERS > 1:
+        pool = ProcessPoolExecutor(max_workers=config.PLOT_WORKERS, initializer=_silence_worker)
+    pending = []
     
-    print("\n" + "="*60)
-    print("STEP 4: EXECUTING QUERIES")
-    print("="*60)
-    queries = load_queries()
-    if not queries:
-        log_error("No queries to execute")
-        return False
-    
-    print(f"Found {len(queries)} queries to execute\n")
-    
-    for idx, query in enumerate(queries, 1):
-        print(f"\n--- Query {idx}/{len(queries)}: {query.get('query_name', 'Unnamed')} ---")
-        if not validate_query(query, idx):
-            continue
-        execute_query(graph, query, config.OUTPUT_DIR)
+    try:
+        print("\n" + "="*60)
+        print("STEP 3: FULL GRAPH VISUALIZATION")
+        print("="*60)
+        full_graph_path = os.path.join(config.OUTPUT_DIR, "full_graph.png")
+        _submit(pool, pending, "full graph", plot_full_graph, graph.get_master_graph(), full_graph_path)
+        
+        print("\n" + "="*60)
+        print("STEP 4: EXECUTING QUERIES")
+        print("="*60)
+        queries = load_queries()
+        if not queries:
+            log_error("No queries to execute")
+            return False
+        
+        print(f"Found {len(queries)} queries to execute\n")
+        
+        for idx, query in enumerate(queries, 1):
+            print(f"\n--- Query {idx}/{len(queries)}: {query.get('query_name', 'Unnamed')} ---")
+            if not validate_query(query, idx):
+                continue
+            execute_query(graph, query, config.OUTPUT_DIR, pool, pending)
+        
+        _wait_for_plots(pending)
+    finally:
+        if pool is not None:
+            pool.shutdown()
     
     print("\n" + "="*60)
     print("STEP 5: GENERATING INDEX.HTML")
@@ -3,12 +3,27 @@ Core module for steel heat treatment process optimization.
 Constructs a directed graph representing all possible treatment paths
 and uses Dijkstra's algorithm to find optimal processes.
 """
+import os
 import pandas as pd
 import numpy as np
 import networkx as nx
 import logging
 import config
 
+def _read_processed_data(path):
+    """
+    Loads the processed dataset, preferring the Parquet copy that preprocess.py
+    writes next to the CSV. The copy is only used while it is at least as new as
+    the CSV; otherwise (or without a Parquet engine) the CSV is parsed.
+    """
+    parquet_path = os.path.splitext(path)[0] + '.parquet'
+    try:
+        if os.path.getmtime(parquet_path) >= os.path.getmtime(path):
+            return pd.read_parquet(parquet_path)
+    except (OSError, ImportError, ValueError):
+        pass
+    return pd.read_csv(path)
+
 class SteelGraph:
     """
     Represents steel heat treatment processes as a multi-layer directed graph.
@@ -27,7 +42,7 @@ class SteelGraph:
             Exception: If data loading or graph construction fails
         """
         try:
-            self.df = pd.read_csv(preprocessed_data_path)
+            self.df = _read_processed_data(preprocessed_data_path)
             
             # Convert numeric columns and drop invalid rows
             cols_to_check = [config.DB_CONFIG.COL_TIME, config.DB_CONFIG.COL_TEMP, config.DB_CONFIG.COL_HARDNESS]
@@ -52,4 +52,4 @@ def log_error(message, level='ERROR', exc_info=None):
     elif level == 'WARNING':
         logger.warning(message, exc_info=exc_info)
     else:
-        logger.error(message, exc_info=exc_info)
\ No newline at end of file
+        logger.error(message, exc_info=exc_info)